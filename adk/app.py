@@ -1,5 +1,8 @@
-from typing import Any, AsyncGenerator, Callable, Optional, TypedDict, Unpack, ClassVar, Literal, Self
+from typing import Any, AsyncGenerator, Callable, Container, Iterable, Iterator, Optional, TypedDict, Unpack, ClassVar, Literal, Self
 import typing
+import asyncio
+import functools
+from dataclasses import dataclass, field
 
 from datetime import datetime, timezone
 
@@ -25,48 +28,105 @@ from ..text.printing import prettify
 class InvalidSessionException(Exception):
     pass
 
+_UTC = timezone.utc
+
+@functools.lru_cache(maxsize=4096)
+def _iso_utc(ts: float) -> str:
+    return datetime.fromtimestamp(ts, _UTC).isoformat()
+
+# Pre-resolved common names, anything else still goes through types.Modality's own lookup
+_MODALITIES = {m: types.Modality(m) for m in ("audio", "text")}
+
+def _text_content(text: str, role: str = "user") -> types.Content:
+    # Trusted server-side strings, skip pydantic validation
+    return types.Content.model_construct(role=role, parts=[types.Part.model_construct(text=text)])
+
+def _iter_history(events: Iterable[Event], skip: Container[str]) -> Iterator[tuple[str, Message]]:
+    """(event id, message) for every user/agent text event whose id is not in `skip`"""
+    for e in events:
+        if e.author == "system" or e.id in skip:
+            continue
+        content = e.content
+        if not content:
+            continue
+        parts = content.parts
+        if not parts:
+            continue
+        text = parts[0].text
+        if not text:
+            continue
+        # Events come from the session service, no need to validate them again
+        yield e.id, Message.model_construct(
+            id=e.id,
+            sender="user" if e.author == "user" else "agent",
+            content=text,
+            timestamp=_iso_utc(e.timestamp)
+        )
+
 class UserSession(TypedDict):
     user_id: str
     session_id: str
 
 
-class RunSession(BaseModel):
+@dataclass(slots=True)
+class RunSession:
     app: "AdkApp"
     us: UserSession
     session: Session
-
-    def model_post_init(self, context: Any) -> None:
-        super().model_post_init(context)
-        self._session_service: BaseSessionService = typing.cast(BaseSessionService, self.app._runner.session_service)
-        self._artifact_service: BaseArtifactService = typing.cast(BaseArtifactService, self.app._runner.artifact_service)
-        self._memory_service: BaseMemoryService = typing.cast(BaseMemoryService, self.app._runner.memory_service)
-        self._live_queue: LiveRequestQueue | None = None
+    _session_service: BaseSessionService = field(init=False, repr=False)
+    _artifact_service: BaseArtifactService = field(init=False, repr=False)
+    _memory_service: BaseMemoryService = field(init=False, repr=False)
+    _live_queue: LiveRequestQueue | None = field(init=False, repr=False, default=None)
+    _history: dict[str, Message] = field(init=False, repr=False, default_factory=dict)  # event id -> message
+    _history_len: int = field(init=False, repr=False, default=0)
+    _history_tail: str = field(init=False, repr=False, default="")
+    _uid: str = field(init=False, repr=False)
+    _sid: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._session_service = self.app._session_service
+        self._artifact_service = self.app._artifact_service
+        self._memory_service = self.app._memory_service
+        self._uid, self._sid = self.us["user_id"], self.us["session_id"]
 
     def __enter__(self) -> Self:
         self._live_queue = LiveRequestQueue()
         return self
     
     def __exit__(self, *_, **__) -> None:
-        if self._live_queue:
+        # Idempotent, also reached when __enter__ failed half way
+        if self._live_queue is not None:
             self._live_queue.close()
-        self._live_queue = None
+            self._live_queue = None
 
     async def refresh(self) -> None:
-        session = await self._session_service.get_session(app_name=self.app.name, **self.us)
+        session = await self._session_service.get_session(app_name=self.app.name, user_id=self._uid, session_id=self._sid)
         if session is None:
             raise InvalidSessionException("Session Invalidated")
         self.session = session
 
     async def run(self, prompt: str) -> AsyncGenerator:
+        check, extract = self.app.check, self.app.extract
+        run_async = self.app._runner.run_async
+        user_id, session_id = self._uid, self._sid
+        new_message = _text_content(prompt)
+        n_retries, yield_interval = AdkApp.N_RETRIES, AdkApp.YIELD_INTERVAL
+        loop = asyncio.get_running_loop()
+        last_release = loop.time()
+
         err = None
-        for i in range(1, AdkApp.N_RETRIES + 1):
+        for i in range(1, n_retries + 1):
             try:
-                async for ev in self.app._runner.run_async(**self.us, new_message=types.Content(role="user", parts=[types.Part(text=prompt)])):
-                    if self.app.check(ev):
-                        yield self.app.extract(ev)
+                async for ev in run_async(user_id=user_id, session_id=session_id, new_message=new_message):
+                    if check(ev):
+                        yield extract(ev)
+                        # Bursty token streams may never suspend, let other tasks run
+                        if loop.time() - last_release > yield_interval:
+                            await asyncio.sleep(0)
+                            last_release = loop.time()
             except ClientConnectionError as e:
                 err = e
-                yield self.app.extract(Event(author="system", error_code=e.__class__.__name__, error_message=f"{repr(err)}\nRetrying... ({i}/{AdkApp.N_RETRIES})"))
+                yield extract(Event(author="system", error_code=e.__class__.__name__, error_message=f"{repr(err)}\nRetrying... ({i}/{n_retries})"))
             else:
                 break
         else:
@@ -83,10 +143,12 @@ class RunSession(BaseModel):
             4. User transcription 
         Does not yield user audio
         """
-        if not self._live_queue:
+        live_queue = self._live_queue
+        if not live_queue:
             raise InvalidSessionException("Live capabilities are only available using the context manager protocol (with session ...).")
         modalities = modalities or ['text']
-        main_modality = types.Modality("audio" if "audio" in modalities else modalities[0])
+        main = "audio" if "audio" in modalities else modalities[0]
+        main_modality = _MODALITIES.get(main) or types.Modality(main)
         run_config = RunConfig(
             response_modalities=[main_modality],
             streaming_mode=StreamingMode.BIDI,
@@ -97,18 +159,18 @@ class RunSession(BaseModel):
             run_config.output_audio_transcription = types.AudioTranscriptionConfig()
 
         async for event in self.app._runner.run_live(
-            **self.us, live_request_queue=self._live_queue, run_config=run_config
+            user_id=self._uid, session_id=self._sid, live_request_queue=live_queue, run_config=run_config
         ):
             yield self.create_live_msg(event)
 
     def live_send(self, message: LiveMessage) -> None:
-        if not self._live_queue:
+        live_queue = self._live_queue
+        if not live_queue:
             raise ValueError("Live capabilities are available using the context manager protocol (with session ...).")
         if message.mime_type == "text/plain":
-            content = types.Content(role="user", parts=[types.Part.from_text(text=message.content)])
-            self._live_queue.send_content(content)
+            live_queue.send_content(_text_content(message.content))
         elif message.mime_type == "audio/pcm":
-            self._live_queue.send_realtime(types.Blob(data=message.inline_data, mime_type=message.mime_type))
+            live_queue.send_realtime(types.Blob.model_construct(data=message.inline_data, mime_type=message.mime_type))
         else:
             raise ValueError(f"Mime type not supported: {message.mime_type}")
 
@@ -117,19 +179,20 @@ class RunSession(BaseModel):
         if event.turn_complete or event.interrupted:
             # This assert is in case ADK change their API and put 'done'/'interrupted' flags alongside content
             assert event.content is None, "Event has turn_complete flag AND content, make changes so that this content is not ignored!"
-            return LiveMessage(id=event.id, done=event.turn_complete or False, interrupted=event.interrupted or False)
-        content = event.content or types.Content()
-        part = (content.parts or [types.Part()])[0]
-        inline_data = part.inline_data or types.Blob()
-        is_audio = (inline_data.mime_type or "").startswith("audio")
-        data = inline_data.data or b""
-        text_content = part.text or ""
-        return LiveMessage(
+            return LiveMessage.model_construct(id=event.id, done=event.turn_complete or False, interrupted=event.interrupted or False)
+        content = event.content
+        part = content.parts[0] if content and content.parts else None
+        inline_data = part.inline_data if part else None
+        is_audio = bool(inline_data and inline_data.mime_type and inline_data.mime_type.startswith("audio"))
+        data = (inline_data.data if inline_data else None) or b""
+        text_content = (part.text if part else None) or ""
+        # Trusted ADK data: skip validation, model_post_init still checks the text/audio invariant
+        return LiveMessage.model_construct(
             id=event.id,
             timestamp=datetime.fromtimestamp(event.timestamp).isoformat(),
             content=text_content,
             inline_data=data,
-            sender="user" if content.role == "user" else "agent",
+            sender="user" if content and content.role == "user" else "agent",
             mime_type="audio/pcm" if is_audio else "text/plain",
             done=not (is_audio or event.partial)  # audio events are not marked as partial in ADK
         )
@@ -138,16 +201,19 @@ class RunSession(BaseModel):
         if not new_data:
             return
 
+        content = None
+        if tell_agent:
+            content = _text_content(f"State updated:\n{message + '\n' if message else ""}{prettify(new_data)}\n", role="model")
+
         event = Event(
-            author="user",
+            author="system" if tell_agent else "user",
+            content=content,
             actions=EventActions(
                 state_delta=new_data
             )
         )
+        # append_event applies the delta and appends the event to self.session in place
         await self._session_service.append_event(self.session, event=event)
-        if tell_agent:
-            await self.append_message(f"State updated:\n{message + '\n' if message else ""}{prettify(new_data)}\n")
-        await self.refresh()
 
     @property
     def state(self) -> dict[str, Any]:
@@ -155,24 +221,28 @@ class RunSession(BaseModel):
 
     @property
     def history(self) -> list[Message]:
-        return [
-            Message(
-                id=e.id,
-                sender="user" if e.author == "user" else "agent",
-                content=e.content.parts[0].text,
-                timestamp=datetime.fromtimestamp(e.timestamp, timezone.utc).isoformat()
-            )
-            for e in self.session.events
-            if e.content and e.content.parts and e.content.parts[0].text
-            and e.author != "system"
-        ]
+        events = self.session.events
+        seen = self._history_len
+        if seen and (seen > len(events) or events[seen - 1].id != self._history_tail):
+            # The session was replaced by one that does not extend what was rendered
+            live = {e.id for e in events}
+            self._history = {k: m for k, m in self._history.items() if k in live}
+            seen = 0
+        # Events are append-only, only render the ones added since the last read
+        self._history.update(_iter_history(events[seen:], self._history))
+        self._history_len = len(events)
+        self._history_tail = events[-1].id if events else ""
+        return list(self._history.values())
 
     async def save_artifact(self, name: str, artifact: bytes, mime_type: Optional[str] = None) -> int:
         version = await self._artifact_service.save_artifact(
             app_name=self.app.name,
             filename=name,
-            artifact=types.Part.from_bytes(data=artifact, mime_type=mime_type or "application/octet-stream"),
-            **self.us,
+            artifact=types.Part.model_construct(
+                inline_data=types.Blob.model_construct(data=artifact, mime_type=mime_type or "application/octet-stream")
+            ),
+            user_id=self._uid,
+            session_id=self._sid,
         )
         await self.refresh()
         return version
@@ -182,16 +252,17 @@ class RunSession(BaseModel):
             app_name=self.app.name,
             filename=name,
             version=version,
-            **self.us,
+            user_id=self._uid,
+            session_id=self._sid,
         )
 
         return part.inline_data.data if part and part.inline_data else None
     
     async def list_artifacts(self) -> list[str]:
-        return await self._artifact_service.list_artifact_keys(app_name=self.app.name, **self.us)
+        return await self._artifact_service.list_artifact_keys(app_name=self.app.name, user_id=self._uid, session_id=self._sid)
     
     async def list_artifact_versions(self, filename: str) -> list[int]:
-        return await self._artifact_service.list_versions(app_name=self.app.name, **self.us, filename=filename)
+        return await self._artifact_service.list_versions(app_name=self.app.name, user_id=self._uid, session_id=self._sid, filename=filename)
     
     async def save_memory(self) -> None:
         await self._memory_service.add_session_to_memory(self.session)
@@ -200,35 +271,41 @@ class RunSession(BaseModel):
     async def load_memory(self, query: str) -> list[str]:
         memory_contents = await self._memory_service.search_memory(
             app_name=self.app.name,
-            user_id=self.us["user_id"],
+            user_id=self._uid,
             query=query
         )
 
-        return [m.content.parts[0].text for m in memory_contents.memories if m.content and m.content.parts and m.content.parts[0].text]
+        texts = []
+        for m in memory_contents.memories:
+            content = m.content
+            if not content or not content.parts:
+                continue
+            text = content.parts[0].text
+            if text:
+                texts.append(text)
+        return texts
 
     async def append_message(self, message: str, author: str = "system") -> None:
-        await self.app._runner.session_service.append_event(
+        await self._session_service.append_event(
             self.session,
             Event(
                 author=author,
-                content=types.Content(
-                    role="user" if author == "user" else "model",
-                    parts=[types.Part(text=message)]
-                )
+                content=_text_content(message, role="user" if author == "user" else "model")
             )
         )
 
 
+_is_final_response = Event.is_final_response
+
 def check_event(ev: Event) -> bool:
-    return ev.partial or ev.is_final_response()
+    return ev.partial or _is_final_response(ev)
 
 def extract_event(ev: Event) -> Any:
-    if ev.content and ev.content.parts and ev.content.parts[0]:
-        return ev.content.parts[0].text
-    elif ev.error_message:
-        return ev.error_message
-    else:
-        return ev.actions.state_delta
+    # Streamed events almost always carry text, try that first
+    try:
+        return ev.content.parts[0].text  # type: ignore
+    except (AttributeError, TypeError, IndexError):  # no content / no parts / empty parts
+        return ev.error_message or ev.actions.state_delta
 
 
 
@@ -239,55 +316,90 @@ class AdkApp(BaseModel):
     check: Callable[[Event], bool] = check_event
     extract: Callable[[Event], Any] = extract_event
     db_url: str = ""
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
     artifact_path: str = ""
     bucket_name: str = ""
     plugins: list = Field(default_factory=list)
 
     N_RETRIES: ClassVar = 10
+    YIELD_INTERVAL: ClassVar = 0.005
 
     def model_post_init(self, context: Any) -> None:
         super().model_post_init(context)
         self._runner = Runner(
             agent=self.agent,
             app_name=self.name,
-            session_service=DatabaseSessionService(self.db_url) if self.db_url else InMemorySessionService(),
+            session_service=DatabaseSessionService(self.db_url, **self._db_pool_kwargs()) if self.db_url else InMemorySessionService(),
             artifact_service=GcsArtifactService(self.bucket_name) if self.bucket_name else FileSystemArtifactService(self.artifact_path) if self.artifact_path else InMemoryArtifactService(),
             plugins=self.plugins,
         )
+        self._session_service = typing.cast(BaseSessionService, self._runner.session_service)
+        self._artifact_service = typing.cast(BaseArtifactService, self._runner.artifact_service)
+        self._memory_service = typing.cast(BaseMemoryService, self._runner.memory_service)
+        # FileSystemArtifactService is an InMemoryArtifactService backed by disk
+        self._local_artifacts = isinstance(self._artifact_service, InMemoryArtifactService)
+
+    def _db_pool_kwargs(self) -> dict[str, Any]:
+        if self.db_url.startswith("sqlite"):
+            return {}  # in-memory SQLite pools reject queue-pool options, pooling buys nothing there
+        return dict(
+            pool_size=self.db_pool_size,
+            max_overflow=self.db_max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=300,
+        )
     
     async def get_session(self, **us: Unpack[UserSession]) -> RunSession:
-        session = await self._runner.session_service.get_session(
-            app_name=self.name, **us
+        user_id, session_id = us["user_id"], us["session_id"]
+        session = await self._session_service.get_session(
+            app_name=self.name, user_id=user_id, session_id=session_id
         )
 
         if session is None:
-            raise KeyError(f"Session {us["session_id"]} does not exist")
+            raise KeyError(f"Session {session_id} does not exist")
         
         return RunSession(app=self, us=us, session=session)
 
         
     async def create_session(self, state: Optional[dict[str, Any]] = None, **us: Unpack[UserSession]) -> RunSession:
+        merged = dict(self.initial_state)
+        if state:
+            merged.update(state)
         return RunSession(
             app=self, us=us,
-            session=await self._runner.session_service.create_session(
-                app_name=self.name, **us, state=self.initial_state | (state or {})
+            session=await self._session_service.create_session(
+                app_name=self.name, user_id=us["user_id"], session_id=us["session_id"], state=merged
             )
         )
     
     async def delete_session(self, **us: Unpack[UserSession]) -> None:
-        await self._runner.session_service.delete_session(
-            app_name=self.name, **us
+        await self._session_service.delete_session(
+            app_name=self.name, user_id=us["user_id"], session_id=us["session_id"]
         )
     
     async def list_sessions(self, user_id: str) -> list[str]:
-        response = await self._runner.session_service.list_sessions(
+        response = await self._session_service.list_sessions(
             app_name=self.name,
             user_id=user_id
         )
         return [s.id for s in response.sessions]
     
     async def clear_artifacts(self) -> None:
-        if isinstance(self._runner.artifact_service, (InMemoryArtifactService, FileSystemArtifactService)):
-            self._runner.artifact_service.artifacts.clear()
+        if not self._local_artifacts:
+            raise NotImplementedError()
+        service = typing.cast(InMemoryArtifactService, self._artifact_service)
+        if isinstance(service, FileSystemArtifactService):
+            await asyncio.to_thread(service.reset)
         else:
+            service.artifacts.clear()
+
+    async def reset_artifacts(self, artifacts: Optional[dict[str, list[types.Part]]] = None) -> None:
+        """Replace all stored artifacts with `artifacts` (artifact path -> versions)"""
+        if not self._local_artifacts:
             raise NotImplementedError()
+        service = typing.cast(InMemoryArtifactService, self._artifact_service)
+        if isinstance(service, FileSystemArtifactService):
+            await asyncio.to_thread(service.reset, artifacts)
+        else:
+            service.artifacts = artifacts if artifacts is not None else {}
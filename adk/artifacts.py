@@ -1,13 +1,18 @@
-from typing import Iterable, Iterator, Optional, override
+from typing import Any, Callable, Coroutine, Iterable, Iterator, Optional, override
+import os
+import asyncio
+import functools
+import inspect
+import threading
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 from pathlib import Path
 
 from google.adk.artifacts import InMemoryArtifactService
 from google.genai import types
 
 from ..ds import PersistentDict, PersistentList
-from ..ds.persistent import Pair
+from ..ds.persistent import Pair, _undefined
 
 class ArtifactList(PersistentList[types.Part]):
     def __init__(self, root: Path, items: Optional[Iterable] = None):
@@ -16,40 +21,120 @@ class ArtifactList(PersistentList[types.Part]):
             self.extend(items)
 
 class ArtifactDict(PersistentDict[str, ArtifactList]):
+    def model_post_init(self, context) -> None:
+        super().model_post_init(context)
+        self._known: set[str] = set()  # keys seen on disk, saves a stat per write
+
     @override
     def hash(self, key: str):
         return key
     
     @override
-    def __setitem__(self, key: str, value: list) -> None:
+    def _put(self, key: str, value: list) -> bool:
         path = self._get_file_path(key)
-        if not path.exists():
-            self._len_delta()
+        is_new = key not in self._known and not path.exists()
         # The PersistentCollection constructor creates the path and the .meta
         ArtifactList(path, value)
+        self._known.add(key)
+        return is_new
+
+    @override
+    def pop(self, key: str, defaultvalue: Optional[list[types.Part]] = _undefined) -> Optional[list[types.Part]]:
+        """Remove the ArtifactList stored at `key` and return its versions"""
+        self._known.discard(key)
+        if key not in self:
+            if defaultvalue is not _undefined:
+                return defaultvalue
+            raise KeyError(key)
+        # Each value is a directory, not a single file, so read it out before deleting it
+        versions = self[key]
+        parts = list(versions)
+        versions.delete()
+        self._len_delta(-1)
+        return parts
+
+    @override
+    def clear(self) -> None:
+        self._known.clear()
+        super().clear()
 
     @override
     def _load(self, fp: Path) -> Pair[str, ArtifactList]:
-        return Pair[str, ArtifactList](key=str(fp.relative_to(self.root)).replace('\\', '/'), value=ArtifactList(root=fp))
+        key = str(fp.relative_to(self.root)).replace('\\', '/')
+        self._known.add(key)
+        return Pair[str, ArtifactList](key=key, value=ArtifactList(root=fp))
     
     @override
     def _save(self, fp: Path, data: Pair[str, ArtifactList]) -> None:
         return  # the ArtifactList already exists
     
+    def last_version(self, key: str) -> Optional[int]:
+        """Index of the newest version of `key`, read straight from its .meta; None if there is none"""
+        try:
+            meta = self._get_file_path(key) / self._meta.name
+            length = ArtifactList.Metadata.model_validate_json(meta.read_bytes()).length
+        except FileNotFoundError:
+            return None
+        return length - 1 if length else None
+
     @override
     def items(self) -> Iterator[tuple[str, ArtifactList]]:
-        yield from (self._load(f.parent).to_tuple() for f in self.root.rglob('*') if f != self._meta and f.name == self._meta.name)
+        # Every ArtifactList is marked by its own .meta
+        meta_name = self._meta.name
+        yield from (
+            self._load(Path(e.path).parent).to_tuple()
+            for e in self._scan()
+            if e.name == meta_name and e.is_file(follow_symlinks=False)
+        )
+
+
+def _drive[T](coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine that never suspends to completion, without an event loop"""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("InMemoryArtifactService awaited inside a storage call, it cannot run on a worker thread")
 
 
 class FileSystemArtifactService(InMemoryArtifactService):
     artifacts: ArtifactDict = Field(default_factory=lambda: ArtifactDict(root=Path('.')))
+    # Guards every ArtifactDict access; the async API runs the inherited methods under it on a worker thread
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
     def __init__(self, root: str):
         super().__init__(artifacts=ArtifactDict(root=Path(root)))  # type: ignore
 
+    def reset(self, artifacts: Optional[dict[str, list[types.Part]]] = None) -> None:
+        """Replace all stored artifacts with `artifacts` (artifact path -> versions)"""
+        with self._lock:
+            self.artifacts.clear()
+            if artifacts:
+                self.artifacts.update(artifacts)
+
     def get_artifact_path(self, app_name: str, user_id: str, session_id: str, filename: str) -> Optional[str]:
         path = self._artifact_path(app_name, user_id, session_id, filename)
-        versions = self.artifacts.get(path)
-        if not versions:
+        with self._lock:
+            version = self.artifacts.last_version(path)
+        if version is None:
             return None
-        return str((self.artifacts.root / path / str(len(versions) - 1)).resolve())
-    
\ No newline at end of file
+        # Lexical normalization only, resolve() would lstat every path component
+        return os.path.abspath(self.artifacts.root / path / str(version))
+
+    def _locked[T](self, method: Callable[..., Coroutine[Any, Any, T]], *args, **kwargs) -> T:
+        with self._lock:
+            return _drive(method(self, *args, **kwargs))
+
+
+def _offloaded(method: Callable[..., Coroutine[Any, Any, Any]]) -> Callable[..., Coroutine[Any, Any, Any]]:
+    # InMemoryArtifactService's methods are async only for the interface, their bodies are plain dict code
+    # that does blocking file I/O on an ArtifactDict. Arguments pass through, so any ADK signature works.
+    @functools.wraps(method)
+    async def offloaded(self: FileSystemArtifactService, *args, **kwargs):
+        return await asyncio.to_thread(self._locked, method, *args, **kwargs)
+    return offloaded
+
+for _name, _method in vars(InMemoryArtifactService).items():
+    if not _name.startswith('_') and inspect.iscoroutinefunction(_method):
+        setattr(FileSystemArtifactService, _name, _offloaded(_method))
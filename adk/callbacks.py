@@ -1,29 +1,61 @@
 import re
-from typing import Optional, Callable
+from typing import Any, Iterable, Optional, Callable
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models.llm_request import LlmRequest
 from google.genai import types
 
+try:
+    import re2  # optional: linear-time matching (pip install google-re2)
+except ImportError:
+    re2 = None
+
+
+def _compile(pattern: str, use_re2: bool) -> Any:
+    if not use_re2:
+        return re.compile(pattern)
+    if re2 is None:
+        raise ImportError("use_re2=True requires google-re2 (pip install google-re2)")
+    try:
+        return re2.compile(pattern)
+    except re2.error:  # backreferences, lookarounds, ... only these fall back to re
+        return re.compile(pattern)
+
+
+def _skip(text: str) -> types.Content:
+    # Callbacks fire on every agent turn, skip pydantic validation of our own message
+    return types.Content.model_construct(role="model", parts=[types.Part.model_construct(text=text)])
+
+
+def _key_resolver(keys: Optional[list[str | Callable[[CallbackContext], str]]]) -> Callable[[CallbackContext], Iterable[str]]:
+    """Resolve the state keys for one call; without producers the keys are fixed and resolved once."""
+    fixed = tuple(keys or ())
+    if not any(callable(x) for x in fixed):
+        return lambda _: fixed
+    return lambda ctx: [x(ctx) if callable(x) else x for x in fixed]
+
+
 def create_should_run_agent_callback(
         prerequisites: Optional[list[str | Callable[[CallbackContext], str]]] = None,
         cached: Optional[list[str | Callable[[CallbackContext], str]]] = None,
 ) -> Callable[[CallbackContext], Optional[types.Content]]:
+    prereq_keys = _key_resolver(prerequisites)
+    cached_keys = _key_resolver(cached)
+
     def should_run_agent(callback_context: CallbackContext) -> Optional[types.Content]:
         """
         RETURNS
         -------
         Content with a message if the agent should NOT run, None otherwise.
         """
-        extracted_prereqs: list[str] = [x(callback_context) if isinstance(x, Callable) else x for x in prerequisites] if prerequisites else []
-        extracted_cached: list[str] = [x(callback_context) if isinstance(x, Callable) else x for x in cached] if cached else []
+        in_state = callback_context.state.__contains__
 
-        if cached and all(key in callback_context.state for key in extracted_cached):
-            return types.Content(role="model", parts=[types.Part(text=f"Agent {callback_context.agent_name} skipped: {cached} already in state!")])
+        if cached and all(map(in_state, cached_keys(callback_context))):
+            return _skip(f"Agent {callback_context.agent_name} skipped: {cached} already in state!")
         
-        for key in extracted_prereqs:
-            if key not in callback_context.state:
-                return types.Content(role="model", parts=[types.Part(text=f"Agent {callback_context.agent_name} skipped: {key} not in state!")])
+        for key in prereq_keys(callback_context):
+            if not in_state(key):
+                return _skip(f"Agent {callback_context.agent_name} skipped: {key} not in state!")
         
     return should_run_agent
 
@@ -34,11 +66,19 @@ def last_input_only(callback_context: CallbackContext, llm_request: LlmRequest)
 
 def create_purge_request_callback(*,
     include_pattern: Optional[str] = None,
-    exclude_pattern: Optional[str] = None
+    exclude_pattern: Optional[str] = None,
+    use_re2: bool = False
 ) -> Callable[[CallbackContext, LlmRequest], None]:
+    """
+    use_re2: match with google-re2 (linear time) instead of re. RE2 semantics differ: \\d, \\w, \\s are ASCII-only
+    and $ does not match before a trailing newline. Patterns RE2 cannot compile (backreferences, lookarounds) use re.
+    """
+    include = _compile(include_pattern, use_re2) if include_pattern is not None else None
+    exclude = _compile(exclude_pattern, use_re2) if exclude_pattern is not None else None
+
     def purge_request(callback_context: CallbackContext, llm_request: LlmRequest) -> None:
         llm_request.contents[:] = [c for c in llm_request.contents if True
-                                and (include_pattern is None or re.search(include_pattern, str(c)))
-                                and (exclude_pattern is None or not re.search(exclude_pattern, str(c)))]
+                                and (include is None or include.search(str(c)))
+                                and (exclude is None or not exclude.search(str(c)))]
     
     return purge_request
\ No newline at end of file
@@ -1,5 +1,6 @@
 from typing import Literal, Any
-from pydantic import BaseModel, Field, field_serializer, field_validator
+import base64
+from pydantic import BaseModel, Field, ValidationInfo, field_serializer, field_validator
 from google.adk.agents import BaseAgent
 from datetime import datetime;
 from uuid import uuid4
@@ -12,17 +13,25 @@ class Message(BaseModel):
     done: bool = False
 
 class LiveMessage(Message):
-    inline_data: bytes = b""
+    # mime_type must come before inline_data so the validator can see it
     mime_type: str = "text/plain"
+    inline_data: bytes = b""
     interrupted: bool = False
 
     @field_serializer('inline_data')
     def serialize_inline_data(self, inline_data: bytes, _):
-        return inline_data.decode()
+        # Raw PCM is not valid UTF-8, ship audio as base64
+        if self.is_audio:
+            return base64.b64encode(inline_data).decode('ascii')
+        return inline_data.decode('utf-8', errors='replace')
     
     @field_validator('inline_data', mode='before')
-    def deserialize_inline_data(cls, data: str | bytes):
-        return data.encode() if isinstance(data, str) else data
+    def deserialize_inline_data(cls, data: str | bytes, info: ValidationInfo):
+        if not isinstance(data, str):
+            return data
+        if info.data.get('mime_type', "").startswith("audio"):
+            return base64.b64decode(data)
+        return data.encode()
 
     def model_post_init(self, context: Any) -> None:
         super().model_post_init(context)
@@ -40,8 +49,10 @@ class LiveMessage(Message):
         return self.mime_type.startswith("audio")
 
 
+# Self-referencing mask: drop the parent back-reference at every depth of the sub_agents tree
+_AGENT_EXCLUDE: dict[str, Any] = {'parent_agent': True}
+_AGENT_EXCLUDE['sub_agents'] = {"__all__": _AGENT_EXCLUDE}
+
 def dump_agent(agent: BaseAgent) -> dict[str, Any]:
     """ Assume parent field name and sub_agents field name will remain unchanged """
-    exc: dict[str, Any] = {'parent_agent': True}
-    exc['sub_agents'] = {"__all__": exc}
-    return agent.model_dump(exclude=exc)
\ No newline at end of file
+    return agent.model_dump(exclude=_AGENT_EXCLUDE)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from .transcribe import transcribe
+from .transcribe import transcribe, transcribe_stream
 from .vad import VAD
 
-__all__ = ["transcribe", "VAD"]
\ No newline at end of file
+__all__ = ["transcribe", "transcribe_stream", "VAD"]
\ No newline at end of file
@@ -1,13 +1,20 @@
-from google.cloud.speech import RecognitionAudio, RecognitionConfig, SpeechAsyncClient
+from typing import AsyncGenerator, AsyncIterable
+from google.cloud.speech import (
+    RecognitionAudio, RecognitionConfig, SpeechAsyncClient,
+    StreamingRecognitionConfig, StreamingRecognizeRequest,
+)
 from google.api_core.exceptions import InvalidArgument
 
-async def transcribe(client: SpeechAsyncClient, data: bytes, *, sample_rate: int = 16000, language: str = "he-IL") -> str:
-    audio = RecognitionAudio(content=data)
-    config = RecognitionConfig(
+def _config(sample_rate: int, language: str) -> RecognitionConfig:
+    return RecognitionConfig(
         encoding=RecognitionConfig.AudioEncoding.LINEAR16,
         sample_rate_hertz=sample_rate,
         language_code=language,
     )
+
+async def transcribe(client: SpeechAsyncClient, data: bytes, *, sample_rate: int = 16000, language: str = "he-IL") -> str:
+    audio = RecognitionAudio(content=data)
+    config = _config(sample_rate, language)
     try:
         response = await client.recognize(config=config, audio=audio)
     except InvalidArgument as e:
@@ -15,3 +22,15 @@ async def transcribe(client: SpeechAsyncClient, data: bytes, *, sample_rate: int
     if not response.results:
         return ""
     return response.results[0].alternatives[0].transcript
+
+async def transcribe_stream(client: SpeechAsyncClient, audio: AsyncIterable[bytes], *, sample_rate: int = 16000, language: str = "he-IL") -> AsyncGenerator[str, None]:
+    """Yields final transcripts while `audio` chunks are still being sent"""
+    async def requests() -> AsyncGenerator[StreamingRecognizeRequest, None]:
+        yield StreamingRecognizeRequest(streaming_config=StreamingRecognitionConfig(config=_config(sample_rate, language)))
+        async for chunk in audio:
+            yield StreamingRecognizeRequest(audio_content=chunk)
+
+    async for response in await client.streaming_recognize(requests()):
+        for result in response.results:
+            if result.is_final and result.alternatives:
+                yield result.alternatives[0].transcript
@@ -1,22 +1,32 @@
 import webrtcvad
+import asyncio
 import collections
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from pydantic import BaseModel, computed_field, Field
 from typing import Deque, Any, Optional, Literal
 
+# One worker keeps frames of a stream in submission order
+_VAD_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vad")
+
 
 class VAD(BaseModel):
     aggressiveness: Literal[1, 2, 3, 4]
     frame_ms: Literal[10, 20, 30] = 30
     sample_rate: Literal[8000, 16000, 32000, 48000] = 16_000
     window_size: int = 100
+    silence_threshold: int = 0  # chunks whose peak |sample| is at most this are silence
 
     def model_post_init(self, context: Any) -> None:
         super().model_post_init(context)
         self._vad = webrtcvad.Vad(self.aggressiveness)
-        self._is_voiced_tracking: Deque[bool] = collections.deque(maxlen=self.window_size)
+        self._frame_size = int(self.sample_rate * self.frame_ms / 1000) * 2
+        self._pad = bytearray(self._frame_size)
+        # Ring of the last window_size speech flags, _voiced_idx points at the oldest
+        self._is_voiced_tracking = bytearray(self.window_size)
+        self._voiced_idx: int = 0
         self._input: Deque[bytes] = collections.deque(maxlen=self.window_size)
 
-        self._is_voiced_tracking.extend([False] * self.window_size)
         self._input.append(b"\0\0")
 
         self._voiced_total: int = 0
@@ -25,29 +35,53 @@ class VAD(BaseModel):
     @computed_field
     @property
     def frame_size(self) -> int:
-        return int(self.sample_rate * self.frame_ms / 1000) * 2
+        return self._frame_size
 
     @property
     def triggered(self) -> bool:
         return self._voiced_total > 0 or self._unvoiced_total < (self.window_size / 4)
 
     def is_speech(self, audio: bytes) -> bool:
-        if not any(audio):
-            return False
+        # Silent chunks never reach webrtcvad
+        thr = self.silence_threshold
+        if not thr:
+            # Digital silence: a C-level byte count, no array for tiny frames
+            if audio.count(0) == len(audio):
+                return False
+        else:
+            # Vectorized peak check over an int16 view, min/max instead of abs() which overflows on -32768
+            samples = np.frombuffer(audio, dtype=np.int16, count=len(audio) // 2)
+            if not samples.size or (samples.max() <= thr and samples.min() >= -thr):
+                return False
         
-        for i in range(0, len(audio), self.frame_size):
-            chunk = audio[i:i+self.frame_size]
-            frame = chunk + b"\0" * (self.frame_size - len(chunk))
-            if self._vad.is_speech(frame, self.sample_rate):
+        frame_size, sample_rate, vad = self._frame_size, self.sample_rate, self._vad
+        view = memoryview(audio)
+        full_end = len(audio) - len(audio) % frame_size
+        for i in range(0, full_end, frame_size):
+            if vad.is_speech(view[i:i+frame_size], sample_rate):
                 return True
+        if full_end < len(audio):
+            # Zero-padded copy of the partial last frame into the reusable scratch frame
+            pad, tail_len = self._pad, len(audio) - full_end
+            pad[:tail_len] = view[full_end:]
+            pad[tail_len:] = bytes(frame_size - tail_len)
+            return vad.is_speech(pad, sample_rate)
         return False
 
     def process(self, audio: bytes) -> Optional[bytes]:
-        is_speech = self.is_speech(audio)
-        
-        was_speech = self._is_voiced_tracking[0]
+        return self._step(audio, self.is_speech(audio))
+
+    async def process_async(self, audio: bytes) -> Optional[bytes]:
+        """`process` with the detection running on the shared VAD thread instead of the event loop"""
+        is_speech = await asyncio.get_running_loop().run_in_executor(_VAD_POOL, self.is_speech, audio)
+        return self._step(audio, is_speech)
+
+    def _step(self, audio: bytes, is_speech: bool) -> Optional[bytes]:
+        tracking, idx = self._is_voiced_tracking, self._voiced_idx
+        was_speech = tracking[idx]
+        tracking[idx] = is_speech
+        self._voiced_idx = idx + 1 if idx + 1 < len(tracking) else 0
         self._voiced_total += is_speech - was_speech
-        self._is_voiced_tracking.append(is_speech)
 
         res = None
         if self.triggered:
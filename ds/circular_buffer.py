@@ -7,7 +7,7 @@ class CircularBuffer:
         self.buf = empty_buffer
         self.size = empty_buffer.shape[0]
         self.count: int = 0
-        self._space = asyncio.Condition()
+        self._space = asyncio.Event()  # set whenever a read frees space
         self._lock = asyncio.Lock()
     
     def read(self, n: int) -> np.ndarray:
@@ -16,18 +16,29 @@ class CircularBuffer:
         
         if self.r + n <= self.size:
             result = self.buf[self.r:self.r + n]
-        else:
-            first_part = self.buf[self.r:]
-            second_part = self.buf[:n - len(first_part)]
-            result = np.concatenate([first_part, second_part])
+            self.r = (self.r + n) % self.size
+            self.count -= n
+            self._space.set()
+            return result
         
+        result = np.empty((n,) + self.buf.shape[1:], dtype=self.buf.dtype)
+        self.read_into(result)
+        return result
+    
+    def read_into(self, out: np.ndarray) -> int:
+        """Read up to len(out) items into `out` without allocating, returns the number read"""
+        n = min(out.shape[0], self.count)
+        first = min(n, self.size - self.r)
+        np.copyto(out[:first], self.buf[self.r:self.r + first])
+        np.copyto(out[first:n], self.buf[:n - first])
         self.r = (self.r + n) % self.size
         self.count -= n
-        return result
+        self._space.set()
+        return n
     
     async def notify(self) -> None:
-        async with self._space:
-            self._space.notify_all()
+        # Reads wake writers on their own, kept for callers that still call it
+        self._space.set()
 
     def write(self, data: np.ndarray) -> None:
         available_space = self.size - self.count
@@ -37,9 +48,9 @@ class CircularBuffer:
     
     async def try_write(self, data: np.ndarray) -> None:
         async with self._lock:
-            async with self._space:
-                while data.shape[0] > self.size - self.count:
-                    await self._space.wait()
+            while data.shape[0] > self.size - self.count:
+                self._space.clear()
+                await self._space.wait()
             self._write(data)
     
     def _write(self, data: np.ndarray) -> None:
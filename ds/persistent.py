@@ -1,11 +1,26 @@
 from pydantic import BaseModel
 from pathlib import Path
 from typing import Any, Optional, Iterator, Iterable
+import os
+import mmap
+import hashlib
 import shutil
 import typing
 import pickle
 
 _undefined = object()
+_MMAP_MIN_BYTES = 1 << 20
+
+def _save_file(fp: Path, obj: Any) -> None:
+    fp.write_bytes(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+def _load_file(fp: Path) -> Any:
+    """Unpickle `fp`, large files are unpickled straight from a read-only mapping instead of a bytes copy"""
+    with open(fp, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < _MMAP_MIN_BYTES:
+            return pickle.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return pickle.loads(mm)
 
 class PersistentCollection(BaseModel):
     class Metadata(BaseModel):
@@ -21,7 +36,7 @@ class PersistentCollection(BaseModel):
         self.__filesystem_setup()
 
     def __len__(self) -> int:
-        return self.Metadata.model_validate_json(self._meta.read_text()).length
+        return self._read_meta().length
 
     def clear(self) -> None:
         shutil.rmtree(self.root)
@@ -30,10 +45,24 @@ class PersistentCollection(BaseModel):
     def delete(self) -> None:
         shutil.rmtree(self.root)
 
+    def _scan(self) -> Iterator[os.DirEntry]:
+        """Every non-directory entry under root except our own .meta.
+        DirEntry caches the file type from the directory listing, so there is no stat per entry."""
+        root = str(self.root)
+        meta = os.path.join(root, self._meta.name)  # same spelling scandir gives entry.path
+        stack = [root]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.path != meta:
+                        yield entry
+
     def _len_delta(self, delta: int = 1) -> None:
         meta = self._read_meta()
         meta.length = meta.length + delta
-        self._meta.write_text(meta.model_dump_json())
+        self._write_meta(meta)
 
     def _read_meta(self) -> Metadata:
         return self.Metadata.model_validate_json(self._meta.read_text())
@@ -58,18 +87,27 @@ class Pair[Tk, Tv](BaseModel):
 
 class PersistentDict[Tk, Tv](PersistentCollection):
     def hash(self, key: Tk) -> str:
-        raise NotImplementedError()
+        """
+        Relative file path for `key`. The default handles str, int and bytes keys with a 64 bit BLAKE2b
+        sharded on its first byte; override it for any other key type.
+        """
+        if isinstance(key, str):
+            data = b"s" + key.encode()
+        elif isinstance(key, int):
+            data = b"i" + str(int(key)).encode()  # True and 1 are the same key
+        elif isinstance(key, bytes):
+            data = b"b" + key
+        else:
+            raise TypeError(f"{self.__class__.__name__}.hash() has no default for {type(key).__name__} keys, override hash()")
+        h = hashlib.blake2b(data, digest_size=8).hexdigest()
+        return f"{h[:2]}/{h}"
     
     def __contains__(self, key: Tk) -> bool:
         return self._get_file_path(key).exists()
     
     def __setitem__(self, key: Tk, value: Tv) -> None:
-        file_path = self._get_file_path(key)
-        if not file_path.exists():
+        if self._put(key, value):
             self._len_delta()
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-
-        self._save(file_path, Pair[Tk, Tv](key=key, value=value))
     
     def __getitem__(self, key: Tk) -> Tv:
         file_path = self._get_file_path(key)
@@ -102,16 +140,20 @@ class PersistentDict[Tk, Tv](PersistentCollection):
     def update(self, other: Optional[Any] = None, **kwargs) -> None:
         """Update the dict with key-value pairs from another dict or iterable of pairs"""
         if other is None:
-            for key, value in kwargs.items():
-                self[typing.cast(Tk, key)] = value
-            return
-        
-        if hasattr(other, 'keys'):
-            for key in other.keys():
-                self[key] = other[key]
+            pairs = ((typing.cast(Tk, key), value) for key, value in kwargs.items())
+        elif hasattr(other, 'keys'):
+            pairs = ((key, other[key]) for key in other.keys())
         else:
-            for key, value in other:
-                self[key] = value
+            pairs = iter(other)
+
+        added = 0
+        try:
+            for key, value in pairs:
+                added += self._put(key, value)
+        finally:
+            # One metadata write for the whole batch
+            if added:
+                self._len_delta(added)
         
     def keys(self) -> Iterator[Tk]:
         yield from (p[0] for p in self.items())
@@ -120,13 +162,27 @@ class PersistentDict[Tk, Tv](PersistentCollection):
         yield from (p[1] for p in self.items())
 
     def items(self) -> Iterator[tuple[Tk, Tv]]:
-        yield from (self._load(f).to_tuple() for f in self.root.rglob('*') if f.is_file() and f != self._meta)
+        yield from (self._load(Path(e.path)).to_tuple() for e in self._scan() if e.is_file())
+
+    def _put(self, key: Tk, value: Tv) -> bool:
+        """Write the entry without touching the length, returns whether the key is new"""
+        file_path = self._get_file_path(key)
+        is_new = not file_path.exists()
+        if is_new:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._save(file_path, Pair[Tk, Tv](key=key, value=value))
+        return is_new
 
     def _load(self, fp: Path) -> Pair[Tk, Tv]:
-        return Pair[Tk, Tv].model_validate(pickle.loads(fp.read_bytes()))
+        data = _load_file(fp)
+        if isinstance(data, dict):  # files written as model_dump() by older versions
+            return Pair[Tk, Tv].model_validate(data)
+        key, value = data
+        return Pair[Tk, Tv].model_construct(key=key, value=value)
     
     def _save(self, fp: Path, data: Pair[Tk, Tv]) -> None:
-        fp.write_bytes(pickle.dumps(data.model_dump()))
+        # The pair was validated on construction, pickle the objects themselves
+        _save_file(fp, (data.key, data.value))
     
     def _get_file_path(self, key: Tk) -> Path:
         return self.root / self.hash(key)
@@ -135,28 +191,35 @@ class PersistentDict[Tk, Tv](PersistentCollection):
 class PersistentList[T](PersistentCollection):
     def __setitem__(self, idx: int, item: T) -> None:
         idx = self._validate_index(idx)
-        self._get_file_path(idx).write_bytes(pickle.dumps(item))
+        _save_file(self._get_file_path(idx), item)
     
     def __getitem__(self, idx: int) -> T:
         idx = self._validate_index(idx)
-        return pickle.loads(self._get_file_path(idx).read_bytes())
+        return _load_file(self._get_file_path(idx))
     
     def __iter__(self):
-        yield from (self[i] for i in range(len(self)))
+        # Indices below the length are known valid, skip _validate_index
+        yield from (_load_file(self._get_file_path(i)) for i in range(len(self)))
     
+    # Mutations read .meta once and write back the same Metadata object, no second read for the update
     def append(self, item: T) -> None:
-        self._get_file_path(len(self)).write_bytes(pickle.dumps(item))
-        self._len_delta()
+        meta = self._read_meta()
+        _save_file(self._get_file_path(meta.length), item)
+        meta.length += 1
+        self._write_meta(meta)
     
     def insert(self, idx: int, item: T) -> None:
-        current_len = len(self)
+        meta = self._read_meta()
+        current_len = meta.length
         idx = max(0, current_len + idx) if idx < 0 else min(idx, current_len)
-        self._shift_files(idx, 1)
-        self._get_file_path(idx).write_bytes(pickle.dumps(item))
-        self._len_delta()
+        self._shift_files(idx, current_len, 1)
+        _save_file(self._get_file_path(idx), item)
+        meta.length += 1
+        self._write_meta(meta)
     
     def pop(self, idx: int = -1) -> T:
-        current_len = len(self)
+        meta = self._read_meta()
+        current_len = meta.length
         if current_len == 0:
             raise IndexError("pop from empty list")
         
@@ -165,13 +228,13 @@ class PersistentList[T](PersistentCollection):
         if idx < 0 or idx >= current_len:
             raise IndexError("pop index out of range")
         
-        item = self[idx]
-        
         file_path = self._get_file_path(idx)
+        item = _load_file(file_path)
         file_path.unlink()
         
-        self._shift_files(idx + 1, -1)
-        self._len_delta(-1)
+        self._shift_files(idx + 1, current_len, -1)
+        meta.length -= 1
+        self._write_meta(meta)
         return item
     
     def remove(self, item: T) -> None:
@@ -182,14 +245,23 @@ class PersistentList[T](PersistentCollection):
         raise ValueError(f"{item} not in list")
     
     def extend(self, items: Iterable[T]) -> None:
-        for item in items:
-            self.append(item)
+        meta = self._read_meta()
+        start = end = meta.length
+        try:
+            for item in items:
+                _save_file(self._get_file_path(end), item)
+                end += 1
+        finally:
+            # One metadata write for the whole batch, also counts what was written before a failure
+            if end != start:
+                meta.length = end
+                self._write_meta(meta)
 
     def _get_file_path(self, idx: int) -> Path:
         return self.root / str(idx)
     
-    def _shift_files(self, start_idx: int, shift: int) -> None:
-        start_to_end = range(start_idx, len(self))
+    def _shift_files(self, start_idx: int, end_idx: int, shift: int) -> None:
+        start_to_end = range(start_idx, end_idx)
         for i in (start_to_end if shift < 0 else reversed(start_to_end)):
             old_path = self._get_file_path(i)
             if old_path.exists():
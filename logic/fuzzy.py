@@ -1,12 +1,18 @@
+import sys
 from typing import Iterable, Optional
 
 def most(iterable: Iterable, *,
         n_fail: Optional[int] = 1,
         p_fail: Optional[float] = 0.2
     ) -> bool:
-    check = [bool(x) for x in iterable]
-    n_passed = sum(check)
-    n_total = len(check)
+    np = sys.modules.get("numpy")  # an ndarray can only exist once numpy has been imported
+    if np is not None and isinstance(iterable, np.ndarray) and iterable.ndim == 1:
+        n_passed = int(np.count_nonzero(iterable))
+        n_total = iterable.size
+    else:
+        check = list(map(bool, iterable))
+        n_passed = check.count(True)
+        n_total = len(check)
     passed = n_passed == n_total
     if passed:
         return passed
@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("google.adk")
+
+from google.adk.agents import LlmAgent
+from google.genai import types
+
+from ..adk.app import AdkApp
+
+US = {'user_id': 'u', 'session_id': 's'}
+
+
+@pytest.fixture(params=['memory', 'filesystem'])
+def app(request, tmp_path) -> AdkApp:
+    artifact_path = str(tmp_path / 'artifacts') if request.param == 'filesystem' else ''
+    return AdkApp(name='app', agent=LlmAgent(name='agent', model='gemini-2.0-flash'), artifact_path=artifact_path)
+
+
+def _part(data: bytes) -> types.Part:
+    return types.Part(inline_data=types.Blob(data=data, mime_type='application/octet-stream'))
+
+
+@pytest.mark.asyncio
+async def test_reset_artifacts_replaces_everything(app: AdkApp):
+    session = await app.create_session(**US)
+    await session.save_artifact('old.txt', b'old')
+
+    await app.reset_artifacts({'app/u/s/new.txt': [_part(b'v0'), _part(b'v1')]})
+    assert await session.list_artifacts() == ['new.txt']
+    assert await session.list_artifact_versions('new.txt') == [0, 1]
+    assert await session.load_artifact('new.txt') == b'v1'
+    assert await session.load_artifact('new.txt', version=0) == b'v0'
+    assert await session.load_artifact('old.txt') is None
+
+
+@pytest.mark.asyncio
+async def test_reset_artifacts_without_argument_clears(app: AdkApp):
+    session = await app.create_session(**US)
+    await session.save_artifact('a.txt', b'a')
+    await app.reset_artifacts()
+    assert await session.list_artifacts() == []
+    assert await session.save_artifact('a.txt', b'again') == 0
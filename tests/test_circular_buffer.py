@@ -0,0 +1,39 @@
+import numpy as np
+
+from ..ds.circular_buffer import CircularBuffer
+
+
+def _wrapped() -> CircularBuffer:
+    buf = CircularBuffer(np.zeros(8, dtype=np.int16))
+    buf.write(np.arange(6, dtype=np.int16))
+    buf.read(5)
+    buf.write(np.arange(6, 12, dtype=np.int16))  # wraps: w ends at 4, r is at 5
+    return buf
+
+
+def test_read_into_across_the_wrap_point():
+    buf = _wrapped()
+    out = np.full(10, -1, dtype=np.int16)
+    assert buf.read_into(out) == 7
+    assert out[:7].tolist() == [5, 6, 7, 8, 9, 10, 11]
+    assert out[7:].tolist() == [-1, -1, -1]
+    assert buf.count == 0
+    assert buf.read_into(out) == 0
+
+
+def test_read_into_partial_then_read():
+    buf = _wrapped()
+    out = np.empty(2, dtype=np.int16)
+    assert buf.read_into(out) == 2
+    assert out.tolist() == [5, 6]
+    assert buf.read(10).tolist() == [7, 8, 9, 10, 11]
+    assert buf.count == 0
+
+
+def test_read_across_the_wrap_point_copies():
+    buf = _wrapped()
+    result = buf.read(4)
+    assert result.tolist() == [5, 6, 7, 8]
+    buf.write(np.array([100, 101, 102], dtype=np.int16))
+    assert result.tolist() == [5, 6, 7, 8]
+    assert buf.read(6).tolist() == [9, 10, 11, 100, 101, 102]
@@ -0,0 +1,35 @@
+import pytest
+
+from ..text.json import navigate, navigate_raw
+
+OBJ = {'a': [1, {'b': 'c', 'n': None}], 'd': {'e': 2}}
+
+
+def test_navigate_raw_returns_the_value_itself():
+    assert navigate_raw(OBJ, ['a', 1]) == {'b': 'c', 'n': None}
+    assert navigate_raw(OBJ, ['d', 'e']) == 2
+    assert navigate_raw(OBJ, []) is OBJ
+
+
+def test_navigate_raw_null_is_not_a_missing_path():
+    assert navigate_raw(OBJ, ['a', 1, 'n']) is None
+    with pytest.raises(TypeError):
+        navigate_raw(OBJ, None)  # type: ignore[arg-type]
+
+
+def test_navigate_stringifies_and_keeps_none_path():
+    assert navigate(OBJ, ['d', 'e']) == '2'
+    assert navigate(OBJ, None) is None
+
+
+@pytest.mark.parametrize("path, error", [
+    (['a', 5], IndexError),
+    (['x'], KeyError),
+    (['a', 'b'], TypeError),
+    (['d', 0], TypeError),
+    (['a', True], ValueError),
+    (['a', 1.5], ValueError),
+])
+def test_navigate_raw_invalid_paths(path, error):
+    with pytest.raises(error):
+        navigate_raw(OBJ, path)
@@ -0,0 +1,39 @@
+import pytest
+
+from ..ds import PersistentDict
+
+
+@pytest.fixture
+def store(tmp_path) -> PersistentDict:
+    return PersistentDict[object, str](root=tmp_path / 'store')
+
+
+@pytest.mark.parametrize("key", [(1, 2), 1.5, None, object(), frozenset({'a'})])
+def test_hash_rejects_unsupported_key_types(store: PersistentDict, key):
+    with pytest.raises(TypeError, match=type(key).__name__):
+        store.hash(key)
+    with pytest.raises(TypeError):
+        store[key] = 'value'
+    assert len(store) == 0
+
+
+def test_hash_is_sharded_and_stable(tmp_path, store: PersistentDict):
+    h = store.hash('key')
+    shard, name = h.split('/')
+    assert shard == name[:2] and len(name) == 16
+    assert PersistentDict[object, str](root=tmp_path / 'other').hash('key') == h
+
+
+def test_hash_keeps_key_types_apart(store: PersistentDict):
+    assert len({store.hash('1'), store.hash(1), store.hash(b'1')}) == 3
+    assert store.hash(True) == store.hash(1)
+    assert store.hash(False) == store.hash(0)
+
+
+def test_supported_keys_round_trip(store: PersistentDict):
+    for key in ('a', 7, b'\x00raw'):
+        store[key] = repr(key)
+    assert len(store) == 3
+    assert store['a'] == "'a'" and store[7] == '7' and store[b'\x00raw'] == repr(b'\x00raw')
+    assert store.pop(7) == '7'
+    assert 7 not in store and len(store) == 2
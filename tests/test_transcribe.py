@@ -0,0 +1,62 @@
+import asyncio
+from types import SimpleNamespace
+from typing import AsyncIterator
+
+import pytest
+
+from ..audio.transcribe import transcribe_stream
+
+
+def _result(transcript: str, is_final: bool = True) -> SimpleNamespace:
+    return SimpleNamespace(is_final=is_final, alternatives=[SimpleNamespace(transcript=transcript)])
+
+
+class _FakeClient:
+    """Answers each audio chunk with an interim result and every second chunk with a final one"""
+    def __init__(self) -> None:
+        self.requests: list = []
+
+    async def streaming_recognize(self, requests) -> AsyncIterator[SimpleNamespace]:
+        async def responses() -> AsyncIterator[SimpleNamespace]:
+            async for request in requests:
+                self.requests.append(request)
+                if not request.audio_content:
+                    continue
+                chunk = request.audio_content.decode()
+                results = [_result(chunk + '...', is_final=False)]
+                if len(self.requests) % 2 == 1:
+                    results.append(_result(chunk))
+                results.append(SimpleNamespace(is_final=True, alternatives=[]))
+                yield SimpleNamespace(results=results)
+        return responses()
+
+
+async def _audio(chunks: list[bytes], sent: list[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        sent.append(chunk)
+        yield chunk
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_transcribe_stream_yields_finals_while_sending():
+    client, sent = _FakeClient(), []
+    chunks = [b'a', b'b', b'c', b'd']
+    out = []
+    async for transcript in transcribe_stream(client, _audio(chunks, sent), sample_rate=8000, language='en-US'):  # type: ignore[arg-type]
+        out.append((transcript, len(sent)))
+    assert out == [('b', 2), ('d', 4)]
+
+    config = client.requests[0].streaming_config.config
+    assert config.sample_rate_hertz == 8000
+    assert config.language_code == 'en-US'
+    assert not client.requests[0].audio_content
+    assert [r.audio_content for r in client.requests[1:]] == chunks
+
+
+@pytest.mark.asyncio
+async def test_transcribe_stream_empty_audio():
+    client = _FakeClient()
+    out = [t async for t in transcribe_stream(client, _audio([], []))]  # type: ignore[arg-type]
+    assert out == []
+    assert len(client.requests) == 1
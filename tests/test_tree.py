@@ -0,0 +1,87 @@
+import pytest
+
+from ..tree import ArenaTree
+from ..tree.tree import Tree
+
+
+def _tree() -> Tree:
+    tree = Tree('root')
+    tree.insert('root', 'a')
+    tree.insert('root', 'b')
+    tree.insert('a', 'a1')
+    tree.insert('a', 'a2')
+    tree.insert('a2', 'a2x')
+    tree.insert('b', 'b1')
+    tree.insert('root', 'c')
+    return tree
+
+
+def _descendants(tree: Tree, name: str) -> list[str]:
+    out, stack = [], [tree[name]]
+    while stack:
+        node = stack.pop()
+        out.append(node.name)
+        stack.extend(reversed(node.children))
+    return out
+
+
+def test_arena_matches_tree_shape():
+    tree = _tree()
+    arena = ArenaTree(tree)
+    assert len(arena) == len(tree)
+    assert list(arena) == _descendants(tree, 'root')
+    for node in tree:
+        assert node.name in arena
+        i = arena.id(node.name)
+        assert arena.depth[i] == node.depth
+        assert arena.parent[i] == (arena.id(node.parent.name) if node.parent else -1)
+    assert 'missing' not in arena
+
+
+def test_arena_children_and_subtree():
+    tree = _tree()
+    arena = ArenaTree(tree)
+    for node in tree:
+        assert arena.children(node.name) == [child.name for child in node.children]
+        assert arena.subtree(node.name) == _descendants(tree, node.name)
+
+
+def test_arena_is_ancestor():
+    tree = _tree()
+    arena = ArenaTree(tree)
+    for ancestor in tree:
+        for node in tree:
+            expected = node.name != ancestor.name and node.name in _descendants(tree, ancestor.name)
+            assert arena.is_ancestor(ancestor.name, node.name) is expected
+
+
+def test_arena_is_a_snapshot():
+    tree = _tree()
+    arena = ArenaTree(tree)
+    tree.insert('c', 'c1')
+    tree.pop('a')
+    assert 'c1' not in arena
+    assert arena.children('root') == ['a', 'b', 'c']
+    with pytest.raises(KeyError):
+        arena.children('c1')
+
+
+def test_dump_without_uids_round_trips():
+    tree = _tree()
+    data = tree.dump(include_uids=False)
+    assert 'uid' not in data['root']
+    rebuilt = Tree(**data)
+    assert rebuilt.dump() == data
+    assert [node.name for node in rebuilt] == [node.name for node in tree]
+    assert rebuilt['a2x'].uid == tree['a2x'].uid
+    assert rebuilt['a2x'].parent.name == 'a2'
+
+
+def test_dump_with_uids_matches_nodes():
+    tree = _tree()
+    data = tree.dump(include_uids=True)
+    stack = [data['root']]
+    while stack:
+        node = stack.pop()
+        assert node['uid'] == tree[node['name']].uid
+        stack.extend(node['children'])
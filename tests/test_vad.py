@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from ..audio.vad import VAD
+
+FRAME = 480  # 30 ms at 16 kHz
+
+
+class _Probe:
+    """Stands in for webrtcvad.Vad, records the frames that reach it"""
+    def __init__(self) -> None:
+        self.frames: list[bytes] = []
+
+    def is_speech(self, frame, sample_rate: int) -> bool:
+        self.frames.append(bytes(frame))
+        return False
+
+
+def _chunks() -> list[bytes]:
+    rng = np.random.default_rng(0)
+    t = np.arange(FRAME * 4) / 16_000
+    tone = (8000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+    noise = rng.integers(-12000, 12000, FRAME * 3, dtype=np.int16)
+    silence = np.zeros(FRAME * 2, dtype=np.int16)
+    # Speech bursts separated by silence long enough to untrigger a window of 8
+    parts = [tone, noise, silence, tone[:FRAME + 100], silence[:7]] + [silence] * 20
+    return [p.tobytes() for p in parts] * 4
+
+
+@pytest.mark.asyncio
+async def test_process_async_matches_process():
+    sync_vad, async_vad = VAD(aggressiveness=2, window_size=8), VAD(aggressiveness=2, window_size=8)
+    emitted = 0
+    for chunk in _chunks():
+        out = await async_vad.process_async(chunk)
+        assert out == sync_vad.process(chunk)
+        assert async_vad.triggered == sync_vad.triggered
+        emitted += out is not None
+    assert 0 < emitted < len(_chunks())
+
+
+def test_digital_silence_is_not_speech():
+    vad = VAD(aggressiveness=1)
+    assert not vad.is_speech(bytes(FRAME * 2))
+    assert not vad.is_speech(b"")
+
+
+def test_silence_threshold_screens_quiet_chunks():
+    quiet = np.full(FRAME, 300, dtype=np.int16)
+    quiet[::2] = -300
+    loud = quiet.copy()
+    loud[10] = 301
+    vad = VAD(aggressiveness=1, silence_threshold=300)
+    assert not vad.is_speech(quiet.tobytes())
+    assert not vad.is_speech(b"")
+    # A single sample over the threshold hands the chunk to webrtcvad
+    vad._vad = probe = _Probe()
+    assert not vad.is_speech(loud.tobytes())
+    assert probe.frames == [loud.tobytes()]
+
+
+def test_silence_threshold_handles_the_most_negative_sample():
+    vad = VAD(aggressiveness=1, silence_threshold=32767)
+    assert not vad.is_speech(np.full(FRAME, 32767, dtype=np.int16).tobytes())
+    vad._vad = probe = _Probe()
+    vad.is_speech(np.full(FRAME, -32768, dtype=np.int16).tobytes())
+    assert len(probe.frames) == 1
@@ -6,14 +6,21 @@ NIQQUD = r'[\u0591-\u05C7]'
 HEBREW = r'[\u0590-\u05FF]'
 REVERSED_NIQQUD = r'[\u05bc\u05c2\u05b9]'
 SHIN = fr'\u05e9{NIQQUD}?\u05c2'
-PATTERNS = [
+NIQQUD_PATTERNS = [
     (re.compile(fr'({NIQQUD})\s+({HEBREW})'), r'\1\2'),
     (re.compile(fr'({REVERSED_NIQQUD})({HEBREW})'), r'\2\1'),
     (re.compile(fr'({SHIN}) ({HEBREW})'), r'\1\2'),
-    (re.compile(r' +'), r' '),
 ]
+SPACES = (re.compile(r' +'), r' ')
+PATTERNS = [*NIQQUD_PATTERNS, SPACES]
+
+# Every NIQQUD_PATTERNS match contains a niqqud mark, one scan decides whether to run them at all
+_ANY_NIQQUD = re.compile(NIQQUD)
 
 def clean_hebrew(text: str) -> str:
-    for pat, rep in PATTERNS:
-        text = pat.sub(rep, text)
+    if _ANY_NIQQUD.search(text):
+        for pat, rep in NIQQUD_PATTERNS:
+            text = pat.sub(rep, text)
+    if '  ' in text:  # otherwise there is no run to collapse
+        text = SPACES[0].sub(SPACES[1], text)
     return unicodedata.normalize("NFC", text).strip()
\ No newline at end of file
@@ -1,25 +1,66 @@
-from typing import Iterable
+from typing import Any, Callable, Iterable
 
-def navigate(obj: dict | list, path: Iterable[str | int] | None) -> str | None:
+def _err_msg(path: list) -> str:
+    return f"Invalid Path: {path}"
+
+def _index(seq: list, idx: int, path: list) -> Any:
+    if idx < 0 or idx >= len(seq):
+        raise IndexError(f"{_err_msg(path)}\nIndex out of range.\nlength={len(seq)}\nindex={idx}")
+    return seq[idx]
+
+def _field(mapping: dict, field: str, path: list) -> Any:
+    if field not in mapping:
+        raise KeyError(f"{_err_msg(path)}\nField {field} does not exist.\nfields={list(mapping.keys())}")
+    return mapping[field]
+
+def _list_by_str(seq: list, field: str, path: list) -> Any:
+    raise TypeError(f"{_err_msg(path)}\nCannot index list with a string.\nlist={seq}\nstring={field}")
+
+def _dict_by_int(mapping: dict, idx: int, path: list) -> Any:
+    raise TypeError(f"{_err_msg(path)}\nCannot index object with an integer.\nobject={mapping}\ninteger={idx}")
+
+def _bad_key(current: Any, key: Any, path: list) -> Any:
+    raise ValueError(f"{_err_msg(path)}\nKeys may only be strings or integer indices!")
+
+# Exact (container, key) types, bool is deliberately absent
+_STEPS: dict[tuple[type, type], Callable[[Any, Any, list], Any]] = {
+    (list, int): _index,
+    (dict, str): _field,
+    (list, str): _list_by_str,
+    (dict, int): _dict_by_int,
+}
+
+def _step(current: Any, key: Any, path: list) -> Any:
+    """Subclasses of list/dict/str/int, same rules as the exact types"""
+    is_idx = isinstance(key, int) and not isinstance(key, bool)
+    if isinstance(current, list):
+        if is_idx:
+            return _index(current, key, path)
+        if isinstance(key, str):
+            return _list_by_str(current, key, path)
+    elif isinstance(current, dict):
+        if isinstance(key, str):
+            return _field(current, key, path)
+        if is_idx:
+            return _dict_by_int(current, key, path)
+    return _bad_key(current, key, path)
+
+def navigate_raw(obj: dict | list, path: Iterable[str | int]) -> Any:
+    """
+    The value at `path` itself, for callers that keep walking or inspecting it.
+    Unlike navigate, a None path raises instead of returning None, so None always means a JSON null at `path`.
+    """
     if path is None:
-        return None
+        raise TypeError("path must be an iterable of keys, use [] for the object itself")
     
+    path = list(path)
     current = obj
-    err_msg = f"Invalid Path: {list(path)}"
+    steps = _STEPS
     for key in path:
-        match (current, key):
-            case (list() as seq, int() as idx) if not isinstance(key, bool):
-                if idx < 0 or idx >= len(seq):
-                    raise IndexError(f"{err_msg}\nIndex out of range.\nlength={len(seq)}\nindex={idx}")
-                current = seq[idx]
-            case (dict() as mapping, str() as field):
-                if field not in mapping:
-                    raise KeyError(f"{err_msg}\nField {field} does not exist.\nfields={list(mapping.keys())}")
-                current = mapping[field]
-            case (list() as seq, str() as field):
-                raise TypeError(f"{err_msg}\nCannot index list with a string.\nlist={seq}\nstring={field}")
-            case (dict() as mapping, int() as idx) if not isinstance(key, bool):
-                raise TypeError(f"{err_msg}\nCannot index object with an integer.\nobject={mapping}\ninteger={idx}")
-            case _:
-                raise ValueError(f"{err_msg}\nKeys may only be strings or integer indices!")
-    return str(current)
\ No newline at end of file
+        current = steps.get((current.__class__, key.__class__), _step)(current, key, path)
+    return current
+
+def navigate(obj: dict | list, path: Iterable[str | int] | None) -> str | None:
+    if path is None:
+        return None
+    return str(navigate_raw(obj, path))
@@ -1,10 +1,26 @@
 import black
+import functools
 from typing import Any
 
+_MODE = black.Mode(line_length=120)
+_CACHE_MAX_CHARS = 4096  # larger reprs are formatted but not kept, bounds the cache to about 1M chars
+
+@functools.lru_cache(maxsize=256)
+def _prettify_str(s: str) -> str:
+    return black.format_str(s, mode=_MODE)
+
 def prettify(obj):
-    return black.format_str(str(obj), mode=black.Mode(line_length=120))
+    s = str(obj)
+    return _prettify_str(s) if len(s) <= _CACHE_MAX_CHARS else black.format_str(s, mode=_MODE)
+
+def clear_prettify_cache() -> None:
+    _prettify_str.cache_clear()
 
 
 def shorten(s: Any, m=250) -> str:
-    s = str(s)
-    return s if len(s) < m else (s[:(m // 2)] + '...' + s[-(m // 2):])
\ No newline at end of file
+    if s.__class__ is not str:
+        s = str(s)
+    if len(s) < m:
+        return s
+    half = m // 2
+    return f"{s[:half]}...{s[-half:]}"  # one join instead of two intermediate concatenations
\ No newline at end of file
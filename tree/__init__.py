@@ -1,3 +1,4 @@
 from .tree import BaseTree, BaseNode
+from .arena import ArenaTree
 
-__all__ = ["BaseTree", "BaseNode"]
\ No newline at end of file
+__all__ = ["BaseTree", "BaseNode", "ArenaTree"]
\ No newline at end of file
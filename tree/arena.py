@@ -0,0 +1,71 @@
+from array import array
+from typing import Iterator
+
+from .tree import BaseTree
+
+
+class ArenaTree:
+    """
+    Read-only snapshot of a BaseTree laid out as parallel arrays in pre-order.
+    Node i's subtree is the contiguous range [i, end[i]), so walks and subtree queries
+    are index arithmetic over flat arrays instead of chasing node objects.
+    Changes to the source tree after the snapshot is taken are not reflected.
+    """
+    __slots__ = ("names", "parent", "depth", "end", "_ids")
+
+    def __init__(self, tree: BaseTree) -> None:
+        self.names: list[str] = []
+        self.parent = array('i')
+        self.depth = array('i')
+        self._ids: dict[str, int] = {}
+
+        names, parent, depth, ids = self.names, self.parent, self.depth, self._ids
+        stack = [(tree.root, -1, 0)]
+        while stack:
+            node, parent_id, d = stack.pop()
+            node_id = ids[node.name] = len(names)
+            names.append(node.name)
+            parent.append(parent_id)
+            depth.append(d)
+            stack.extend((child, node_id, d + 1) for child in reversed(node.children))
+
+        # A subtree ends where the next node at the same or a shallower depth starts
+        n = len(names)
+        end = array('i', [n]) * n
+        open_ids: list[int] = []
+        for i in range(n):
+            while open_ids and depth[open_ids[-1]] >= depth[i]:
+                end[open_ids.pop()] = i
+            open_ids.append(i)
+        self.end = end
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, node_name: str) -> bool:
+        return node_name in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def id(self, node_name: str) -> int:
+        return self._ids[node_name]
+
+    def children(self, node_name: str) -> list[str]:
+        i = self._ids[node_name]
+        names, end = self.names, self.end
+        out = []
+        child, stop = i + 1, end[i]
+        while child < stop:
+            out.append(names[child])
+            child = end[child]
+        return out
+
+    def subtree(self, node_name: str) -> list[str]:
+        """Names of the node and all its descendants, in pre-order"""
+        i = self._ids[node_name]
+        return self.names[i:self.end[i]]
+
+    def is_ancestor(self, ancestor: str, node_name: str) -> bool:
+        a, i = self._ids[ancestor], self._ids[node_name]
+        return a < i < self.end[a]
@@ -1,13 +1,25 @@
-from typing import Optional, Generator, Any, Self, override
+import sys
+from typing import Optional, Generator, Any, ClassVar, Self, override
 from pydantic import BaseModel, PrivateAttr, computed_field, Field
 
 class MaxDepthExceededError(Exception):
     pass
 
+def _intern(name: str) -> str:
+    # Node names are looked up constantly, interned keys let dict lookups hit on identity
+    return sys.intern(name) if type(name) is str else name
+
+def _reindex(children: list, start: int = 0) -> None:
+    """Refresh the sibling index hints of children[start:]"""
+    for i in range(start, len(children)):
+        children[i]._sibling_index = i
+
 class BaseNode(BaseModel):
     name: str = Field(frozen=True)
     children: list[Self] = Field(default_factory=list)
     parent: Optional[Self] = Field(default=None, repr=False, exclude=True)
+    # Last known position in parent.children, checked on every read since children can be edited directly
+    _sibling_index: int = PrivateAttr(-1)
 
     def __str__(self):
         return f"{self.__class__.__name__}({self.__repr_str__(', ')})"
@@ -18,20 +30,40 @@ class BaseNode(BaseModel):
     @property
     def index(self) -> Optional[int]:
         if self.parent:
-            return self.parent.children.index(self)
+            children = self.parent.children
+            i = self._sibling_index
+            if 0 <= i < len(children) and children[i] is self:
+                return i
+            i = self._sibling_index = children.index(self)
+            return i
 
     @index.setter
     def index(self, new_index: int) -> None:
-        if self.index is None or self.parent is None:
+        old_index = self.index
+        if old_index is None or self.parent is None:
             raise ValueError("Cannot set index to a node with no parent!")
-        self.parent.children.pop(self.index)
-        self.parent.children.insert(new_index, self)
+        children = self.parent.children
+        # Same target as pop(old_index) followed by insert(new_index), done as one same-length slice rotation
+        last = len(children) - 1
+        new = max(0, last + new_index) if new_index < 0 else min(new_index, last)
+        if new > old_index:
+            children[old_index:new + 1] = children[old_index + 1:new + 1] + [self]
+        elif new < old_index:
+            children[new:old_index + 1] = [self] + children[new:old_index]
+        else:
+            return
+        for i in range(min(old_index, new), max(old_index, new) + 1):
+            children[i]._sibling_index = i
 
     @property
     def depth(self) -> int:
-        return len(self.uid)
+        # Count parent links, len(uid) would also look up the index at every level
+        depth, current = 0, self.parent
+        while current is not None:
+            depth += 1
+            current = current.parent
+        return depth
 
-    @computed_field
     @property
     def uid(self) -> list[int]:
         current = self
@@ -44,61 +76,82 @@ class BaseNode(BaseModel):
 
 
 class BaseTree[Tn: BaseNode](BaseModel):
-    __max_depth: Optional[int] = PrivateAttr(None)
-    __nodes: dict[str, Tn] = PrivateAttr(default_factory=dict)
-    __name: str = PrivateAttr()
+    # Plain fields read straight from the instance dict, assignments are routed through __setattr__
+    name: str
+    max_depth: Optional[int] = None
+    # Depth of the deepest node, kept up to date by insert and pop so max_depth can be checked without a walk
+    _current_max_depth: int = PrivateAttr(0)
+    _nodes: dict[str, Tn] = PrivateAttr(default_factory=dict)
+
+    # Argument names of insert() used by __setitem__, read once per class
+    _insert_argname: ClassVar[str]
+    _node_argname: ClassVar[str]
 
     """Override these in subclasses"""
     _node_type: type[Tn] = PrivateAttr()
 
     def __init__(self, name: str, *, max_depth: Optional[int] = None, root: Optional[Tn | dict[str, Any]] = None, **kwargs) -> None:
-        super().__init__(**kwargs)
-        self.__name = name
-        self.__max_depth = max_depth
+        name = _intern(name)
+        super().__init__(name=name, max_depth=max_depth, **kwargs)
         if root is None:
-            self.__nodes[name] = self._node_type(name=name)
+            self._nodes[name] = self._node_type(name=name)
             return
         
         if isinstance(root, dict):
             root = self._node_type(**root)
         
-        def setup_node(node: Tn, parent: Optional[Tn] = None):
-            self.__nodes[node.name] = node
+        # Pre-order with an explicit stack, deep trees don't hit the recursion limit
+        nodes = self._nodes
+        max_seen = 0
+        stack: list[tuple[Tn, Optional[Tn], int]] = [(root, None, 0)]
+        while stack:
+            node, parent, depth = stack.pop()
+            node.__dict__['name'] = name = _intern(node.name)
+            nodes[name] = node
             node.parent = parent
-            for child in node.children:
-                setup_node(child, node)
-        
-        setup_node(root)
+            if depth > max_seen:
+                max_seen = depth
+            children = node.children
+            for i in range(len(children) - 1, -1, -1):
+                children[i]._sibling_index = i
+                stack.append((children[i], node, depth + 1))
+        self._current_max_depth = max_seen
     
     def insert(self, parent_name: str, node_name: str, index: Optional[int] = None, **kwargs) -> None:
-        if parent_name is not None and parent_name not in self:
+        parent = self._nodes.get(parent_name) if parent_name is not None else None
+        if parent_name is not None and parent is None:
             raise KeyError(f"Parent node '{parent_name}' does not exist")
 
-        node = self._node_type(name=node_name, parent=self.get(parent_name), **kwargs)
+        node = self._node_type(name=_intern(node_name), parent=parent, **kwargs)
         self._insert(node, index)
     """End Override"""
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls._insert_argname = list(cls.insert.__annotations__.keys())[1]
+        cls._node_argname = cls._insert_argname.split('_')[0]
+
     def __getitem__(self, node_name: str) -> Tn:
-        return self.__nodes[node_name]
+        return self._nodes[node_name]
 
     def __str__(self) -> str:
         return f"{self.__class__.__name__}(root='{self.name}', nodes={self.root})"
 
     def __iter__(self) -> Generator[Tn, None, None]:
-        def _traverse(node: Tn) -> Generator[Tn, None, None]:
+        # Pre-order, one generator frame regardless of depth
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
             yield node
-            for child in node.children:
-                yield from _traverse(child)
-
-        yield from _traverse(self.root)
+            stack.extend(reversed(node.children))
 
     def __len__(self) -> int:
-        return len(self.__nodes)
+        return len(self._nodes)
 
     def __setitem__(self, node_name: str, node: dict | Tn) -> None:
         """ This method is bug prone. TODO(Anan): make it easy to inherit without introspection shenanigans"""
-        insert_argname = list(self.insert.__annotations__.keys())[1]
-        node_argname = insert_argname.split('_')[0]
+        insert_argname, node_argname = self._insert_argname, self._node_argname
 
         if isinstance(node, dict):
             if node_name != node[insert_argname]:
@@ -113,54 +166,63 @@ class BaseTree[Tn: BaseNode](BaseModel):
         self._insert(node, index=None)
 
     def __contains__(self, node_name: str) -> bool:
-        return node_name in self.__nodes
+        return node_name in self._nodes
 
-    @computed_field
-    @property
-    def name(self) -> str:
-        return self.__name
-
-    @name.setter
-    def name(self, new_name: str) -> None:
-        self.rename_node(self.__name, new_name)
-        self.__name = new_name
+    def __setattr__(self, attr: str, value: Any) -> None:
+        if attr == 'name':
+            value = _intern(value)
+            self.rename_node(self.name, value)
+        elif attr == 'max_depth' and value is not None and self._current_max_depth > value:
+            raise MaxDepthExceededError("Cannot set max_depth lower than current depth. Delete deeper nodes first.")
+        super().__setattr__(attr, value)
 
     @computed_field
     @property
     def root(self) -> Tn:
-        return self[self.name]
-
-    @computed_field
-    @property
-    def max_depth(self) -> Optional[int]:
-        return self.__max_depth
-
-    @max_depth.setter
-    def max_depth(self, new_max: Optional[int]) -> None:
-        if (
-            new_max is not None
-            and (self.__max_depth is None or new_max < self.__max_depth)
-            and any(node.depth > new_max for node in self)
-        ):
-            raise MaxDepthExceededError("Cannot set max_depth lower than current depth. Delete deeper nodes first.")
-
-        self.__max_depth = new_max
+        return self._nodes[self.name]
 
     def pop(self, node_name: str) -> Tn:
-        if node_name not in self:
+        node = self._nodes.get(node_name)
+        if node is None:
             raise KeyError(f"Node '{node_name}' does not exist")
 
-        node = self[node_name]
-        if node.parent is None or node.index is None:
+        parent, index = node.parent, node.index
+        if parent is None or index is None:
             raise ValueError(f"Cannot pop root node {node_name}!")
 
-        node.parent.children.pop(node.index)
-        for child in node.children.copy():
-            self.pop(child.name)
-        return self.__nodes.pop(node_name)
+        removed_max = node.depth
+        parent.children.pop(index)
+        _reindex(parent.children, index)
+
+        # Drop the whole subtree in one pass; like before, every removed node ends up with no children
+        nodes = self._nodes
+        stack = [(node, removed_max)]
+        while stack:
+            current, depth = stack.pop()
+            nodes.pop(current.name, None)
+            if depth > removed_max:
+                removed_max = depth
+            stack.extend((child, depth + 1) for child in current.children)
+            current.children.clear()
+
+        if removed_max >= self._current_max_depth:
+            # The deepest node may have been removed, the only case that needs a full walk
+            self._current_max_depth = self._deepest()
+        return node
+
+    def dump(self, include_uids: bool = False) -> dict[str, Any]:
+        """model_dump(), optionally with every node's uid added in a single walk of the dumped tree"""
+        data = self.model_dump()
+        if include_uids:
+            stack: list[tuple[dict[str, Any], list[int]]] = [(data['root'], [])]
+            while stack:
+                node, uid = stack.pop()
+                node['uid'] = uid
+                stack.extend((child, uid + [i]) for i, child in enumerate(node['children']))
+        return data
 
     def get(self, node_name: Optional[str], default: Any = None) -> Tn | Any:
-        return self[node_name] if node_name is not None and node_name in self else default
+        return self._nodes.get(node_name, default)
 
     def rename_node(self, node_name: str, new_name: str) -> None:
         node = self[node_name]
@@ -171,22 +233,42 @@ class BaseTree[Tn: BaseNode](BaseModel):
             raise ValueError(f"Node with name '{new_name}' already exists")
 
         # Update the dictionary key and the node name
-        self.__nodes[new_name] = self.__nodes.pop(node_name)
+        new_name = _intern(new_name)
+        nodes = self._nodes
+        nodes[new_name] = nodes.pop(node_name)
         node.__dict__['name'] = new_name
 
+    def _deepest(self) -> int:
+        deepest = 0
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > deepest:
+                deepest = depth
+            stack.extend((child, depth + 1) for child in node.children)
+        return deepest
+
     def _insert(self, node: Tn, index: Optional[int]) -> None:
-        if node.name in self:
+        nodes = self._nodes
+        if node.name in nodes:
             raise ValueError(f"Node with name '{node.name}' already exists")
 
-        if self.max_depth is not None and node.parent and node.parent.depth >= self.max_depth:
-            raise MaxDepthExceededError(f"Cannot insert node: maximum depth of {self.max_depth} exceeded")
+        depth = node.parent.depth + 1 if node.parent else 0
+        max_depth = self.max_depth
+        if max_depth is not None and depth > max_depth:
+            raise MaxDepthExceededError(f"Cannot insert node: maximum depth of {max_depth} exceeded")
 
-        self.__nodes[node.name] = node
+        nodes[_intern(node.name)] = node
+        if depth > self._current_max_depth:
+            self._current_max_depth = depth
         if node.parent:
+            children = node.parent.children
             if index is None:
-                node.parent.children.append(node)
+                node._sibling_index = len(children)
+                children.append(node)
             else:
-                node.parent.children.insert(index, node)
+                children.insert(index, node)
+                _reindex(children, children.index(node))
 
 class Tree(BaseTree[BaseNode]):
     _node_type: type[BaseNode] = BaseNode